@@ -0,0 +1,48 @@
+"""
+Shared helpers for the benchmark scripts: timing stats and result files
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from pipeline.scheduler import percentile  # One nearest-rank definition for /stats/queues and the benchmarks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FOLDER = os.path.join(ROOT, "benchmarks", "results")
+
+
+def summarize(latencies: list, elapsed: float = None) -> dict:
+    """p50/p95/p99 in ms (from seconds) plus throughput when elapsed is given"""
+    summary = {
+        "count": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 3),
+    }
+    if elapsed:
+        summary["throughput_per_s"] = round(len(latencies) / elapsed, 2)
+    return summary
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def write_results(benchmark: str, results, output: str = None, **extra) -> str:
+    """Write a machine-readable result file tagged with commit and timestamp"""
+    output = output or os.path.join(RESULTS_FOLDER, f"{benchmark}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"benchmark": benchmark, "commit": git_commit(), "timestamp": time.time(),
+                   "python": sys.version.split()[0], **extra, "results": results}, f, indent=2)
+    print(f"💾 Results written to {output}")
+    return output
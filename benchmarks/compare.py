@@ -0,0 +1,63 @@
+"""
+Compare Benchmark Results
+Diffs two result files written by the benchmark scripts (e.g. from two
+commits) and flags any latency metric that got slower by more than a threshold.
+
+    python -m benchmarks.compare old/micro.json benchmarks/results/micro.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "import_ms")
+
+
+def _flatten(results, prefix: str = "") -> dict:
+    """Map 'name.metric' -> value for every latency metric in a result tree"""
+    flat = {}
+    if isinstance(results, list):
+        for item in results:
+            name = item.get("module") or item.get("name", "")
+            flat.update(_flatten(item, f"{prefix}{name}."))
+    elif isinstance(results, dict):
+        for key, value in results.items():
+            if key in METRICS and isinstance(value, (int, float)):
+                flat[f"{prefix}{key}"] = value
+            elif isinstance(value, (dict, list)):
+                flat.update(_flatten(value, f"{prefix}{key}."))
+    return flat
+
+
+def compare(old: dict, new: dict, threshold: float) -> list:
+    before, after = _flatten(old["results"]), _flatten(new["results"])
+    rows = []
+    for key in sorted(before.keys() & after.keys()):
+        change = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        rows.append((key, before[key], after[key], change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent slowdown counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.old, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"📊 {old.get('benchmark')}: {old.get('commit') or '?'} -> {new.get('commit') or '?'}")
+    rows = compare(old, new, args.threshold)
+    for key, before, after, change, regressed in rows:
+        print(f"{'❌' if regressed else '✅'} {key:55s} {before:10.3f} -> {after:10.3f}  ({change:+.1f}%)")
+
+    regressions = sum(1 for row in rows if row[4])
+    print(f"{regressions} regression(s) over {args.threshold}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Synthetic Article Corpus
+Deterministic fake news articles in the same shape fetch_latest_news returns,
+so benchmarks can ingest any number of documents without hitting GNews.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+SOURCES = ["Reuters", "BBC", "CNN", "Fox News", "Daily Mail", "Blog", "Reddit", "Nature", "WhatsApp", "Unknown"]
+TOPICS = {
+    "health": ["vaccine", "virus", "hospital", "doctors", "trial", "outbreak", "diet", "cancer", "study", "patients"],
+    "politics": ["election", "minister", "parliament", "vote", "policy", "campaign", "senate", "bill", "court", "protest"],
+    "science": ["climate", "telescope", "species", "energy", "research", "ocean", "fossil", "genome", "planet", "physics"],
+    "finance": ["inflation", "market", "bank", "rates", "stocks", "budget", "crypto", "tax", "trade", "growth"],
+}
+FILLER = ["the", "a", "new", "report", "said", "on", "after", "officials", "according", "to", "in", "with", "by", "year"]
+
+
+def _sentence(rng: random.Random, words: list) -> str:
+    picked = [rng.choice(words if rng.random() < 0.4 else FILLER) for _ in range(rng.randint(8, 18))]
+    return " ".join(picked).capitalize() + "."
+
+
+def make_article(i: int, rng: random.Random, words_per_article: int = 250, now: datetime = None) -> dict:
+    now = now or datetime.now(timezone.utc)
+    topic = rng.choice(list(TOPICS))
+    words = TOPICS[topic]
+    body = []
+    while sum(len(s.split()) for s in body) < words_per_article:
+        body.append(_sentence(rng, words))
+    return {
+        "title": f"{topic.title()} update {i}: {' '.join(rng.sample(words, 3))}",
+        "description": _sentence(rng, words),
+        "content": " ".join(body),
+        "source": rng.choice(SOURCES),
+        "url": f"https://example.com/{topic}/{i}",
+        "published": (now - timedelta(days=rng.uniform(0, 60))).isoformat(),
+        "fetched_at": now.isoformat(),
+        "topic": topic,
+    }
+
+
+def make_corpus(size: int, words_per_article: int = 250, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [make_article(i, rng, words_per_article) for i in range(size)]
+
+
+def article_text(article: dict) -> str:
+    """Same on-disk layout as news_fetcher.save_articles_to_folder"""
+    return f"""TITLE: {article['title']}
+SOURCE: {article['source']}
+DATE: {article['published']}
+URL: {article['url']}
+
+{article['description']}
+
+{article['content']}
+"""
+
+
+def make_claims(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    claims = []
+    for _ in range(count):
+        words = TOPICS[rng.choice(list(TOPICS))]
+        claims.append(f"Claim that the {' '.join(rng.sample(words, 3))} is {rng.choice(['safe', 'fake', 'rising', 'banned'])}")
+    return claims
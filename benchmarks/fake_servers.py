@@ -0,0 +1,161 @@
+"""
+Local Fake LLM and Embedding Servers
+An OpenAI-compatible chat completions endpoint (what the Groq SDK calls) and a
+HuggingFace feature-extraction endpoint, both with configurable latency, so the
+pipeline can be benchmarked or tested end-to-end offline.
+
+    python -m benchmarks.fake_servers --llm-latency 0.4 --embed-latency 0.02
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBED_DIM = 384
+_WORD_RE = re.compile(r"\w+")
+
+
+def fake_embedding(text: str, dim: int = EMBED_DIM) -> list:
+    """Hashed bag-of-words vector: texts sharing words get similar vectors"""
+    vec = [0.0] * dim
+    for word in _WORD_RE.findall(text.lower()):
+        h = int(hashlib.md5(word.encode()).hexdigest(), 16)
+        vec[h % dim] += 1.0 if (h >> 16) & 1 else -1.0
+    return vec
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    jitter = 0.0
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def _send_json(self, status: int, payload, headers: dict = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _sleep(self):
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def log_message(self, format, *args):
+        pass  # Suppress logs
+
+
+class FakeLLMHandler(_Handler):
+    """POST .../chat/completions returning a JSON verdict, with optional 429s"""
+    error_rate = 0.0
+    remaining = None  # x-ratelimit-remaining-requests to report on success; None sends no rate-limit headers
+
+    def do_POST(self):
+        request = self._read_json()
+        if random.random() < self.error_rate:
+            return self._send_json(429, {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                                   {"retry-after": "1", "x-ratelimit-remaining-requests": 0,
+                                    "x-ratelimit-reset-requests": "1s"})
+        self._sleep()
+
+        messages = request.get("messages", [])
+        prompt = " ".join(m.get("content", "") for m in messages)
+        if request.get("response_format", {}).get("type") == "json_object":
+            score = int(hashlib.md5(prompt.encode()).hexdigest(), 16) % 101
+            content = json.dumps({
+                "score": score, "confidence_low": max(0, score - 10), "confidence_high": min(100, score + 10),
+                "verdict": "TRUE" if score > 60 else "FALSE" if score < 40 else "UNVERIFIED",
+                "category": "OTHER", "reasoning": "Synthetic verdict from the fake LLM server.",
+                "key_evidence": ["synthetic evidence"], "claims": ["related claim"],
+            })
+        else:
+            content = messages[-1].get("content", "") if messages else ""
+
+        prompt_tokens = len(prompt.split())
+        completion_tokens = len(content.split())
+        self._send_json(200, {
+            "id": f"fake-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }, None if self.remaining is None else {
+            "x-ratelimit-remaining-requests": self.remaining, "x-ratelimit-reset-requests": "60s",
+        })
+
+
+class FakeEmbeddingHandler(_Handler):
+    """POST with {"inputs": text} returning a 384-dim vector like HF feature-extraction"""
+
+    def do_POST(self):
+        request = self._read_json()
+        self._sleep()
+        self._send_json(200, fake_embedding(str(request.get("inputs", ""))))
+
+
+def start_server(handler: type, port: int = 0, **settings) -> ThreadingHTTPServer:
+    """Start a fake server on a daemon thread; port 0 picks a free port"""
+    handler = type(handler.__name__, (handler,), settings)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fake_env(llm_server=None, embed_server=None) -> dict:
+    """Environment variables that point the pipeline at the fake servers"""
+    env = {}
+    if llm_server:
+        env.update({
+            "LLM_BASE_URL": f"http://127.0.0.1:{llm_server.server_port}", "GROQ_API_KEY": "fake",
+            # The default 0.5/s Groq budget would make load tests measure the limiter queue, not the pipeline
+            "LLM_RATE_PER_SEC": "1000", "LLM_BURST": "1000",
+        })
+    if embed_server:
+        env.update({"HF_API_URL": f"http://127.0.0.1:{embed_server.server_port}/embed", "HF_API_KEY": "fake"})
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run fake LLM and embedding servers")
+    parser.add_argument("--llm-port", type=int, default=8901)
+    parser.add_argument("--embed-port", type=int, default=8902)
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="seconds per completion")
+    parser.add_argument("--embed-latency", type=float, default=0.01, help="seconds per embedding")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of LLM calls answered with 429")
+    parser.add_argument("--remaining", type=int, default=None,
+                        help="report this many remaining requests per 60s window (default: no rate-limit headers)")
+    args = parser.parse_args()
+
+    llm = start_server(FakeLLMHandler, args.llm_port, latency=args.llm_latency,
+                       jitter=args.jitter, error_rate=args.error_rate, remaining=args.remaining)
+    embed = start_server(FakeEmbeddingHandler, args.embed_port, latency=args.embed_latency, jitter=args.jitter)
+    print("✅ Fake servers running. Point the app at them with:")
+    for key, value in fake_env(llm, embed).items():
+        print(f"export {key}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Open-Loop Load Generator
+Sends /ingest and /analyze requests to a running server at a fixed arrival
+rate (Poisson), independent of how fast responses come back. Latency is
+measured from each request's scheduled send time, so a stalled server shows
+up in the tail instead of silently lowering the offered load.
+
+    python -m benchmarks.fake_servers &          # then export the printed env vars
+    python main.py &
+    python -m benchmarks.loadgen --url http://127.0.0.1:7860 --rate 5 --duration 60
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import make_claims, make_corpus
+
+
+def _send(url: str, endpoint: str, payload: dict, scheduled: float, timeout: float, results: dict, lock):
+    try:
+        response = requests.post(f"{url}{endpoint}", json=payload, timeout=timeout)
+        ok = response.status_code == 200
+        if ok and endpoint == "/analyze":
+            # /analyze answers 200 with verdict ERROR for 429s, open circuits and missed deadlines
+            ok = response.json().get("verdict") != "ERROR"
+    except (requests.RequestException, ValueError):
+        ok = False
+    latency = time.perf_counter() - scheduled
+    with lock:
+        results[endpoint]["latencies" if ok else "errors"].append(latency)
+
+
+def run_load(url: str, rate: float, duration: float, ingest_ratio: float, timeout: float,
+             corpus_size: int = 1000, seed: int = 3) -> dict:
+    rng = random.Random(seed)
+    corpus = make_corpus(corpus_size)
+    claims = make_claims(500)
+    results = {e: {"latencies": [], "errors": []} for e in ("/ingest", "/analyze")}
+    lock = threading.Lock()
+
+    pool = ThreadPoolExecutor(max_workers=512)
+    start = time.perf_counter()
+    next_at = start
+    sent = 0
+    while next_at - start < duration:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if rng.random() < ingest_ratio:
+            article = corpus[sent % len(corpus)]
+            endpoint, payload = "/ingest", {"text": article["content"], "source": article["source"]}
+        else:
+            endpoint, payload = "/analyze", {"claim": claims[sent % len(claims)]}
+        pool.submit(_send, url, endpoint, payload, next_at, timeout, results, lock)
+        sent += 1
+        next_at += rng.expovariate(rate)
+    pool.shutdown(wait=True)
+    elapsed = time.perf_counter() - start
+
+    report = {"offered_rate": rate, "sent": sent, "elapsed_s": round(elapsed, 2)}
+    for endpoint, r in results.items():
+        report[endpoint] = {**summarize(r["latencies"], elapsed), "errors": len(r["errors"])}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator for /ingest and /analyze")
+    parser.add_argument("--url", default="http://127.0.0.1:7860")
+    parser.add_argument("--rate", type=float, default=5.0, help="requests per second (Poisson arrivals)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--ingest-ratio", type=float, default=0.2, help="fraction of requests sent to /ingest")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--corpus-size", type=int, default=1000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    print(f"🚀 {args.rate}/s for {args.duration}s against {args.url}")
+    report = run_load(args.url, args.rate, args.duration, args.ingest_ratio, args.timeout, args.corpus_size)
+    for endpoint in ("/ingest", "/analyze"):
+        r = report[endpoint]
+        print(f"⏱️ {endpoint:9s} {r['count']:6d} ok {r['errors']:5d} err  "
+              f"{r.get('throughput_per_s', 0):7.2f}/s  p50 {r['p50_ms']:9.1f} ms  "
+              f"p95 {r['p95_ms']:9.1f} ms  p99 {r['p99_ms']:9.1f} ms")
+    write_results("loadgen", report, args.output, url=args.url)
+
+
+if __name__ == "__main__":
+    main()
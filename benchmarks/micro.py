@@ -0,0 +1,136 @@
+"""
+Micro-Benchmarks
+Per-module latency for the hot paths: vector store searches, context
+re-ranking, prompt compression and report generation, over a synthetic
+corpus. SimpleVectorStore embeddings come from the local fake embedding
+server; the shared index uses its local sentence-transformer model.
+
+    python -m benchmarks.micro --size 500 --iterations 200
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import summarize, write_results
+from benchmarks.corpus import article_text, make_claims, make_corpus
+from benchmarks.fake_servers import FakeEmbeddingHandler, fake_env, start_server
+
+
+def _time(fn, args_list: list) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    for args in args_list:
+        t = time.perf_counter()
+        fn(*args)
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def bench_simple_vector_store(corpus, claims, tmp):
+    from pipeline.vector_store import SimpleVectorStore
+    store = SimpleVectorStore()
+    for article in corpus:
+        store.add_document(article_text(article), {"source": article["source"]})
+    return _time(store.search, [(c, 5) for c in claims])
+
+
+def bench_pathway_vector_store(corpus, claims, tmp):
+    from pipeline import pathway_engine
+    pathway_engine.DATA_FOLDER = os.path.join(tmp, "pathway")
+    store = pathway_engine.PathwayVectorStore()
+    for article in corpus:
+        store.add_document(article_text(article), {"source": article["source"]})
+    return _time(store.search, [(c, 5) for c in claims])
+
+
+def bench_shared_index(corpus, claims, tmp):
+    from pipeline.shared_index import IndexReader, IndexWriter
+    articles, index = os.path.join(tmp, "articles"), os.path.join(tmp, "index")
+    os.makedirs(articles, exist_ok=True)
+    paths = []
+    for i, article in enumerate(corpus):
+        paths.append(os.path.join(articles, f"article_{i}.txt"))
+        with open(paths[-1], "w", encoding="utf-8") as f:
+            f.write(article_text(article))
+    writer = IndexWriter(folder=index, data_folder=articles)
+    for start in range(0, len(paths), 100):  # Several segments, like a live writer would produce
+        writer.add_files(paths[start:start + 100])
+    reader = IndexReader(folder=index)
+    reader.refresh()
+    return _time(reader.search, [(c, 12) for c in claims])
+
+
+def _retrieved(corpus, rng, k: int = 12) -> list:
+    return [
+        {"text": article_text(a), "dist": rng.uniform(0.1, 0.9), "metadata": {"path": a["url"]}}
+        for a in rng.sample(corpus, min(k, len(corpus)))
+    ]
+
+
+def bench_rerank(corpus, claims, tmp):
+    from pipeline.reranker import rerank_chunks
+    rng = random.Random(1)
+    return _time(rerank_chunks, [(_retrieved(corpus, rng), 1200) for _ in claims])
+
+
+def bench_compress_context(corpus, claims, tmp):
+    from pipeline.prompt_builder import compress_context
+    rng = random.Random(2)
+    cases = [("\n".join(c["text"] for c in _retrieved(corpus, rng)), claim, 1500) for claim in claims]
+    return _time(compress_context, cases)
+
+
+def bench_generate_report(corpus, claims, tmp):
+    from pipeline.pdf_generator import generate_report
+    result = {"score": 72, "verdict": "TRUE", "category": "HEALTH", "reasoning": "Synthetic.",
+              "key_evidence": ["point 1", "point 2", "point 3"]}
+    sources = [{"source": a["source"]} for a in corpus[:5]]
+    return _time(generate_report, [(claim, result, sources) for claim in claims])
+
+
+BENCHMARKS = {
+    "simple_vector_store.search": bench_simple_vector_store,
+    "pathway_vector_store.search": bench_pathway_vector_store,
+    "shared_index.search": bench_shared_index,
+    "reranker.rerank_chunks": bench_rerank,
+    "prompt_builder.compress_context": bench_compress_context,
+    "pdf_generator.generate_report": bench_generate_report,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run per-module micro-benchmarks")
+    parser.add_argument("--size", type=int, default=500, help="articles in the synthetic corpus")
+    parser.add_argument("--words", type=int, default=250, help="words per article")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="fake embedding server latency (seconds)")
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    # Must be set before pipeline.embedder is imported
+    embed = start_server(FakeEmbeddingHandler, latency=args.embed_latency)
+    os.environ.update(fake_env(embed_server=embed))
+
+    corpus = make_corpus(args.size, args.words)
+    claims = make_claims(args.iterations)
+    results = {}
+    for name in args.only:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                results[name] = BENCHMARKS[name](corpus, claims, tmp)
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+        r = results[name]
+        if "error" in r:
+            print(f"❌ {name}: {r['error']}")
+        else:
+            print(f"⏱️ {name:34s} p50 {r['p50_ms']:9.3f} ms  p95 {r['p95_ms']:9.3f} ms  p99 {r['p99_ms']:9.3f} ms")
+
+    write_results("micro", results, args.output, corpus_size=args.size, iterations=args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Startup Benchmark
+Times a cold import of main.py and each pipeline module in a fresh
+interpreter, so regressions in import-time work show up across commits.
+
+    python -m benchmarks.startup --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import ROOT, write_results
+
+MODULES = [
+    "main",
+    "pipeline.embedder",
+    "pipeline.fact_checker",
+    "pipeline.llm_client",
+    "pipeline.news_fetcher",
+    "pipeline.pathway_engine",
+    "pipeline.pdf_generator",
+    "pipeline.prompt_builder",
+    "pipeline.reranker",
+    "pipeline.scheduler",
+    "pipeline.shared_index",
+    "pipeline.translator",
+    "pipeline.vector_store",
+]
+
+_SNIPPET = "import time, importlib; t = time.perf_counter(); importlib.import_module({!r}); print(time.perf_counter() - t)"
+
+
+def time_import(module: str, repeat: int) -> dict:
+    """Import `module` in `repeat` fresh interpreters; report in-process and wall-clock times"""
+    imports, walls = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", _SNIPPET.format(module)],
+            cwd=ROOT, capture_output=True, text=True,
+            env={**os.environ, "WARMUP_ON_STARTUP": "0"},
+        )
+        walls.append(time.perf_counter() - started)
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1:]}
+        imports.append(float(proc.stdout.strip().splitlines()[-1]))
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(imports) * 1000, 1),
+        "process_ms": round(statistics.median(walls) * 1000, 1),
+        "repeat": repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modules", nargs="*", default=MODULES)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        r = time_import(module, args.repeat)
+        results.append(r)
+        if "error" in r:
+            print(f"❌ {module}: {r['error']}")
+        else:
+            print(f"⏱️ {module:28s} import {r['import_ms']:8.1f} ms   process {r['process_ms']:8.1f} ms")
+
+    write_results("startup", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
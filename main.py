@@ -1,33 +1,94 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from pydantic import BaseModel
-import pathway as pw
-from pathway.xpacks.llm.vector_store import VectorStoreServer
-from pathway.xpacks.llm.embedders import SentenceTransformerEmbedder
-from pathway.xpacks.llm.splitters import TokenCountSplitter
-import uvicorn
 import threading
 import os
 import json
-from groq import Groq
 from datetime import datetime
+import time
+from pipeline.reranker import rerank_chunks
+from pipeline.prompt_builder import build_messages, record_usage, get_token_stats
+from pipeline.llm_client import get_llm
+from pipeline.scheduler import get_scheduler
 
 app = FastAPI()
 
 # --- CONFIG ---
 DATA_FOLDER = "./data/articles"
 os.makedirs(DATA_FOLDER, exist_ok=True)
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+RETRIEVE_K = int(os.getenv("RETRIEVE_K", "12"))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+VECTOR_PORT = 8765
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+INDEX_MODE = os.getenv("INDEX_MODE", "shared" if WEB_WORKERS > 1 else "pathway")  # "shared" = mmap'd index
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
 
-# --- PATHWAY SETUP ---
-embedder = SentenceTransformerEmbedder(model="all-MiniLM-L6-v2")
-documents = pw.io.fs.read(path=DATA_FOLDER, format="plaintext", mode="streaming", with_metadata=True)
-vector_server = VectorStoreServer(documents, embedder=embedder, splitter=TokenCountSplitter(max_tokens=400))
+# --- PATHWAY SETUP (deferred: Pathway and the embedding model load in warmup, not at import) ---
+_pathway_thread = None
+_pathway_lock = threading.Lock()
+_vector_ready = False
 
 def start_pathway():
-    vector_server.run_server(host="0.0.0.0", port=8765, threaded=False)
+    from pathway.xpacks.llm.vector_store import VectorStoreServer
+    from pathway.xpacks.llm.embedders import SentenceTransformerEmbedder
+    from pathway.xpacks.llm.splitters import TokenCountSplitter
+    import pathway as pw
 
-t = threading.Thread(target=start_pathway, daemon=True)
-t.start()
+    embedder = SentenceTransformerEmbedder(model="all-MiniLM-L6-v2")
+    documents = pw.io.fs.read(path=DATA_FOLDER, format="plaintext", mode="streaming", with_metadata=True)
+    vector_server = VectorStoreServer(documents, embedder=embedder, splitter=TokenCountSplitter(max_tokens=400))
+    vector_server.run_server(host="0.0.0.0", port=VECTOR_PORT, threaded=False)
+
+def warmup():
+    """Start the Pathway vector server once, in the background (or map the shared index)"""
+    global _pathway_thread
+    if INDEX_MODE == "shared":
+        from pipeline.shared_index import get_encoder, get_index_reader
+        get_index_reader().refresh()
+        get_encoder()  # Load the query embedder now; raises if the model is unavailable
+        return
+    with _pathway_lock:
+        if _pathway_thread is None or not _pathway_thread.is_alive():  # Restart if the server died
+            _pathway_thread = threading.Thread(target=start_pathway, daemon=True)
+            _pathway_thread.start()
+
+def vector_ready() -> bool:
+    """True once the Pathway server answers; cached while its thread stays alive"""
+    global _vector_ready
+    if INDEX_MODE == "shared":
+        from pipeline.shared_index import get_index_reader
+        reader = get_index_reader()
+        return reader.refresh() > 0 and reader.get_stats()["model_loaded"]
+    if _pathway_thread is None or not _pathway_thread.is_alive():
+        _vector_ready = False
+    elif not _vector_ready:
+        try:
+            import requests
+            requests.post(f"http://127.0.0.1:{VECTOR_PORT}/v1/statistics", json={}, timeout=1).raise_for_status()
+            _vector_ready = True
+        except Exception:
+            pass
+    return _vector_ready
+
+@app.on_event("startup")
+def on_startup():
+    if WARMUP_ON_STARTUP:
+        warmup()
+
+def retrieve(query: str, k: int) -> list:
+    if INDEX_MODE == "shared":
+        from pipeline.shared_index import get_index_reader
+        return get_index_reader().search(query, top_k=k)
+    import requests
+    return requests.post(f"http://0.0.0.0:{VECTOR_PORT}/v1/retrieve", json={"query": query, "k": k}).json()
+
+ANALYZE_PROMPT = """Analyze this claim based on the context. Return JSON:
+{
+    "score": 0-100,
+    "verdict": "TRUE|FALSE|MISLEADING|UNVERIFIED",
+    "reasoning": "Explanation",
+    "category": "HEALTH|POLITICS|SCIENCE|FINANCE|OTHER",
+    "key_evidence": ["point 1", "point 2"]
+}"""
 
 # --- ENDPOINTS ---
 class Payload(BaseModel):
@@ -38,47 +99,75 @@ class Payload(BaseModel):
 @app.get("/")
 def health(): return {"status": "active", "files": len(os.listdir(DATA_FOLDER))}
 
+@app.get("/live")
+def live(): return {"status": "alive"}
+
+@app.get("/ready")
+def ready(response: Response):
+    # Probes only report; warmup is started at startup or by the first /analyze
+    if not vector_ready():
+        response.status_code = 503
+        return {"status": "warming_up" if INDEX_MODE == "shared" or _pathway_thread else "cold"}
+    return {"status": "ready"}
+
+@app.get("/stats/tokens")
+def token_stats(): return get_token_stats()
+
+@app.get("/stats/llm")
+def llm_stats(): return get_llm().get_stats()
+
+@app.get("/stats/queues")
+def queue_stats(): return get_scheduler().get_stats()
+
+@app.get("/stats/index")
+def index_stats():
+    if INDEX_MODE != "shared":
+        return {"mode": INDEX_MODE}
+    from pipeline.shared_index import get_index_reader
+    return {"mode": INDEX_MODE, **get_index_reader().get_stats()}
+
 @app.post("/ingest")
 def ingest(req: Payload):
     import uuid
+    from pipeline.news_fetcher import write_article
     filename = f"{DATA_FOLDER}/{uuid.uuid4().hex}.txt"
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(f"SOURCE: {req.source}\n\n{req.text}")
+    get_scheduler().run("ingest", write_article, filename, f"SOURCE: {req.source}\n\n{req.text}")
     return {"status": "indexed"}
 
 @app.post("/analyze")
-def analyze(req: Payload):
-    # 1. Retrieve
+def analyze(req: Payload, response: Response):
+    # 0. Refuse rather than answer without context while the vector store is still starting
+    if not vector_ready():
+        try:
+            warmup()
+        except Exception as e:
+            print(f"❌ Warmup error: {e}")
+        if not vector_ready():
+            response.status_code = 503
+            response.headers["Retry-After"] = "5"
+            return {"status": "warming_up"}
+
+    # 1. Retrieve (over-fetch, then re-rank into the token budget)
     try:
-        import requests
-        resp = requests.post("http://0.0.0.0:8765/v1/retrieve", json={"query": req.claim, "k": 4}).json()
-        context = "\n".join([d['text'] for d in resp])
-        sources = [d['metadata'].get('path', 'Unknown') for d in resp]
-    except:
+        resp = retrieve(req.claim, RETRIEVE_K)
+        chunks = rerank_chunks(resp, token_budget=CONTEXT_TOKEN_BUDGET)
+        context = "\n".join([d['text'] for d in chunks])
+        sources = [d['metadata'].get('path', 'Unknown') for d in chunks]
+    except Exception as e:
+        print(f"❌ Retrieval error: {e}")
         context = ""
         sources = []
 
     # 2. Analyze
-    groq = Groq(api_key=GROQ_API_KEY)
-    prompt = f"""
-    Analyze this claim based on the context. Return JSON:
-    {{
-        "score": 0-100,
-        "verdict": "TRUE|FALSE|MISLEADING|UNVERIFIED",
-        "reasoning": "Explanation",
-        "category": "HEALTH|POLITICS|SCIENCE|FINANCE|OTHER",
-        "key_evidence": ["point 1", "point 2"]
-    }}
-    CLAIM: {req.claim}
-    CONTEXT: {context}
-    """
+    messages, tokens_in = build_messages(ANALYZE_PROMPT, req.claim, context, token_budget=CONTEXT_TOKEN_BUDGET)
     
     try:
-        chat = groq.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
+        started = time.time()
+        chat = get_scheduler().run(
+            "interactive", get_llm().chat, messages,
             response_format={"type": "json_object"}
         )
+        record_usage("analyze", tokens_in, chat, started)
         res = json.loads(chat.choices[0].message.content)
         res['sources'] = sources
         return res
@@ -86,4 +175,15 @@ def analyze(req: Payload):
         return {"score": 50, "verdict": "ERROR", "reasoning": str(e), "category": "ERROR"}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=7860)
\ No newline at end of file
+    import uvicorn
+    if WEB_WORKERS > 1:
+        os.environ["INDEX_MODE"] = INDEX_MODE = "shared"
+    if INDEX_MODE == "shared":
+        # One writer process owns ingest; every web worker maps the same index read-only
+        import multiprocessing
+        from pipeline.shared_index import run_writer
+        multiprocessing.Process(target=run_writer, daemon=True, name="index-writer").start()
+    if WEB_WORKERS > 1:
+        uvicorn.run("main:app", host="0.0.0.0", port=7860, workers=WEB_WORKERS)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=7860)
\ No newline at end of file
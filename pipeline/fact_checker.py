@@ -1,23 +1,17 @@
 """
 Enhanced Fact Checker with Source Credibility, Confidence Intervals, Related Claims
 """
-import os
-from groq import Groq
 from dotenv import load_dotenv
 import json
 import random
+import re
+import time
+from pipeline.llm_client import get_llm
+from pipeline.scheduler import get_scheduler
+from pipeline.prompt_builder import build_messages, count_tokens, record_usage
 
 load_dotenv()
 
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-if not GROQ_API_KEY:
-    print("❌ GROQ_API_KEY not found!")
-else:
-    print("✅ GROQ API Key loaded!")
-
-groq = Groq(api_key=GROQ_API_KEY)
-
 # ============ FEATURE 1: SOURCE CREDIBILITY ============
 SOURCE_CREDIBILITY = {
     # Tier 1: Very High (90-100)
@@ -39,6 +33,13 @@ SOURCE_CREDIBILITY = {
     "unknown": 40, "blog": 35, "reddit": 40
 }
 
+# Whole-word patterns, longest name first, so "ap" can't match "WhatsApp"
+# and "new york post" wins over any shorter name inside it
+_SOURCE_PATTERNS = [
+    (re.compile(rf"\b{re.escape(key)}\b"), score)
+    for key, score in sorted(SOURCE_CREDIBILITY.items(), key=lambda kv: len(kv[0]), reverse=True)
+]
+
 def get_source_credibility(source_name: str) -> dict:
     """Get credibility score for a source"""
     if not source_name:
@@ -46,8 +47,8 @@ def get_source_credibility(source_name: str) -> dict:
     
     source_lower = source_name.lower()
     
-    for key, score in SOURCE_CREDIBILITY.items():
-        if key in source_lower:
+    for pattern, score in _SOURCE_PATTERNS:
+        if pattern.search(source_lower):
             if score >= 85:
                 level, color = "Very High", "green"
             elif score >= 70:
@@ -63,21 +64,7 @@ def get_source_credibility(source_name: str) -> dict:
 
 
 # ============ MAIN ANALYSIS FUNCTION ============
-def analyze_claim(claim: str, context: str = "", language: str = "en") -> dict:
-    """
-    Analyze a claim with:
-    - Credibility score
-    - Confidence intervals (Feature 7)
-    - Related claims (Feature 8)
-    - Geographic relevance (Feature 16)
-    """
-    try:
-        print(f"🔍 Analyzing: {claim[:50]}...")
-        
-        messages = [
-            {
-                "role": "system",
-                "content": """You are a fact-checker. Analyze the claim and return JSON:
+ANALYZE_SYSTEM_PROMPT = """You are a fact-checker. Analyze the claim and return JSON:
 {
     "score": 0-100,
     "confidence_low": number (lower bound, score minus 5-15),
@@ -101,19 +88,28 @@ Score guide:
 For confidence_low and confidence_high:
 - If very certain: range of 10 points (e.g., 75-85)
 - If uncertain: range of 20-30 points (e.g., 40-70)"""
-            },
-            {
-                "role": "user",
-                "content": f"CLAIM: {claim}\n\nCONTEXT:\n{context}" if context else f"CLAIM: {claim}"
-            }
-        ]
 
-        response = groq.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=messages,
+
+def analyze_claim(claim: str, context: str = "", language: str = "en", queue: str = "interactive") -> dict:
+    """
+    Analyze a claim with:
+    - Credibility score
+    - Confidence intervals (Feature 7)
+    - Related claims (Feature 8)
+    - Geographic relevance (Feature 16)
+    """
+    try:
+        print(f"🔍 Analyzing: {claim[:50]}...")
+        
+        messages, tokens_in = build_messages(ANALYZE_SYSTEM_PROMPT, claim, context)
+        started = time.time()
+
+        response = get_scheduler().run(
+            queue, get_llm().chat, messages,
             response_format={"type": "json_object"},
             temperature=0.3
         )
+        record_usage("analyze_claim", tokens_in, response, started)
 
         result = json.loads(response.choices[0].message.content)
         
@@ -161,24 +157,26 @@ For confidence_low and confidence_high:
 
 
 # ============ FEATURE 8: GET RELATED CLAIMS ============
-def get_related_claims(claim: str, category: str) -> list:
+def get_related_claims(claim: str, category: str, queue: str = "interactive") -> list:
     """Generate related claims people might want to check"""
     try:
-        response = groq.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {
-                    "role": "system",
-                    "content": 'Generate 3 related claims. Return JSON: {"claims": ["claim1", "claim2", "claim3"]}'
-                },
-                {
-                    "role": "user",
-                    "content": f"Original: {claim}\nCategory: {category}"
-                }
-            ],
+        messages = [
+            {
+                "role": "system",
+                "content": 'Generate 3 related claims. Return JSON: {"claims": ["claim1", "claim2", "claim3"]}'
+            },
+            {
+                "role": "user",
+                "content": f"Original: {claim}\nCategory: {category}"
+            }
+        ]
+        started = time.time()
+        response = get_scheduler().run(
+            queue, get_llm().chat, messages,
             response_format={"type": "json_object"},
             temperature=0.7
         )
+        record_usage("related_claims", count_tokens("\n".join(m["content"] for m in messages)), response, started)
         
         result = json.loads(response.choices[0].message.content)
         return result.get("claims", result.get("related_claims", []))
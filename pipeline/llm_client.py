@@ -0,0 +1,370 @@
+"""
+Shared LLM Client
+One Groq client for the whole app with adaptive rate limiting, jittered
+retries, circuit breaking, request hedging and fallback to a second model.
+Point LLM_BASE_URL at any OpenAI-compatible server (e.g. a local fake) to test.
+"""
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PRIMARY_MODEL = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")
+FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "llama-3.3-70b-versatile")  # "" disables fallback
+BASE_URL = os.getenv("LLM_BASE_URL") or None
+
+# Limits are for the whole deployment; with WEB_WORKERS uvicorn processes each
+# one runs its own client, so it only gets its share of the budget
+WORKER_SHARE = 1 / max(1, int(os.getenv("WEB_WORKERS", "1")))
+RATE_PER_SEC = float(os.getenv("LLM_RATE_PER_SEC", "0.5")) * WORKER_SHARE  # Groq free tier is ~30 RPM
+BURST = max(1, int(int(os.getenv("LLM_BURST", "5")) * WORKER_SHARE))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "20"))
+HEDGE_AFTER = float(os.getenv("LLM_HEDGE_AFTER", "6"))  # seconds, 0 disables hedging
+TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
+
+_DURATION_RE = re.compile(r"([\d.]+)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a model's circuit breaker is open and calls are short-circuited"""
+
+
+def parse_duration(value) -> float:
+    """Parse rate-limit durations like '7.66s', '2m59.56s', '250ms' or plain seconds"""
+    if value in (None, ""):
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    return sum(float(n) * _UNITS[unit] for n, unit in _DURATION_RE.findall(str(value)))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose rate adapts to x-ratelimit-* response headers.
+    When callers are queued for budget, tokens are shared between them by
+    weight (stride scheduling), so interactive (8) gets 8 tokens for every
+    batch (1) token instead of starving it.
+    """
+
+    def __init__(self, rate: float = RATE_PER_SEC, capacity: int = BURST):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.paused_until = 0.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)
+        self.waiting = {}  # weight -> number of blocked acquirers
+        self.passes = {}  # weight -> stride-scheduling virtual time
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now and nobody is queued for it"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.waiting or now < self.paused_until or self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def _next_weight(self) -> int:
+        """Waiting weight class with the lowest pass value; ties go to the heavier class"""
+        return min(self.waiting, key=lambda w: (self.passes[w], -w))
+
+    def acquire(self, timeout: float = None, weight: int = 1) -> bool:
+        """Block until a token is available and it is this weight class's turn (or timeout passes)"""
+        weight = max(1, weight)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            if weight not in self.waiting:
+                # A class that was idle must not bank credit from the time it wasn't asking
+                active = [self.passes[w] for w in self.waiting]
+                self.passes[weight] = max(self.passes.get(weight, 0.0), min(active, default=0.0))
+            self.waiting[weight] = self.waiting.get(weight, 0) + 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._next_weight() == weight and now >= self.paused_until and self.tokens >= 1:
+                        self.tokens -= 1
+                        self.passes[weight] += 1.0 / weight
+                        return True
+                    if deadline is not None and now >= deadline:
+                        return False
+                    wait_for = max(self.paused_until - now, (1 - self.tokens) / self.rate if self.rate > 0 else 1.0)
+                    if deadline is not None:
+                        wait_for = min(wait_for, deadline - now)
+                    self.cond.wait(max(wait_for, 0.005))
+            finally:
+                self.waiting[weight] -= 1
+                if not self.waiting[weight]:
+                    del self.waiting[weight]
+                self.cond.notify_all()  # Another class may be next in line now
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for a while (e.g. after a 429 with retry-after)"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def update_from_headers(self, headers):
+        """Slow down when the server reports few remaining requests, recover otherwise"""
+        if not headers:
+            return
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining) * WORKER_SHARE  # The server's count covers every worker
+        except ValueError:
+            return
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= self.capacity and reset > 0:
+                self.rate = max(remaining / reset, 0.01)
+            else:
+                self.rate = self.base_rate
+
+
+class CircuitBreaker:
+    """Opens after consecutive failed requests, lets one probe through after a cool-down"""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_after: float = BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self.lock:
+            state = self.state
+            if state == "half-open":
+                # Let a single probe through; re-arm the timer for everyone else
+                self.opened_at = time.monotonic()
+                return True
+            return state == "closed"
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def _retryable_errors() -> tuple:
+    import groq  # Deferred: the SDK pulls in httpx/pydantic, only needed once we call the API
+    return (
+        groq.RateLimitError,
+        groq.APIConnectionError,  # includes APITimeoutError
+        groq.InternalServerError,
+    )
+
+
+def _retry_after(error) -> float:
+    """Server-requested wait, only for 429s; capped at BACKOFF_MAX.
+    x-ratelimit-reset-* is a quota window (can be minutes), not a wait, so it is ignored here."""
+    if getattr(error, "status_code", None) != 429:
+        return 0.0
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    return min(parse_duration(headers.get("retry-after")), BACKOFF_MAX)
+
+
+def _remaining(deadline: float) -> float:
+    """Seconds left before a time.monotonic() deadline, at most LLM_TIMEOUT"""
+    if deadline is None:
+        return TIMEOUT
+    return min(TIMEOUT, deadline - time.monotonic())
+
+
+def backoff_delay(attempt: int, retry_after: float = 0.0) -> float:
+    """Full-jitter exponential backoff, at least the server's retry-after, at most BACKOFF_MAX"""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    return min(BACKOFF_MAX, max(delay, retry_after))
+
+
+class LLMClient:
+    def __init__(self, api_key: str = None, model: str = PRIMARY_MODEL, fallback_model: str = FALLBACK_MODEL,
+                 base_url: str = BASE_URL, max_retries: int = MAX_RETRIES, hedge_after: float = HEDGE_AFTER):
+        import groq
+
+        api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not api_key:
+            print("❌ GROQ_API_KEY not found!")
+        self.client = groq.Groq(
+            api_key=api_key or "missing",
+            base_url=base_url,
+            max_retries=0,  # Retries are handled here, not inside the SDK
+            timeout=TIMEOUT,
+        )
+        self.model = model
+        self.fallback_model = fallback_model if fallback_model and fallback_model != model else None
+        self.max_retries = max_retries
+        self.hedge_after = hedge_after
+        self.buckets = {}
+        self.breakers = {}
+        self.stats = {"calls": 0, "retries": 0, "hedged": 0, "fallbacks": 0, "failures": 0}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm")
+        self._retryable = _retryable_errors()
+
+    def _state(self, model: str):
+        with self._lock:
+            if model not in self.buckets:
+                self.buckets[model] = TokenBucket()
+                self.breakers[model] = CircuitBreaker()
+            return self.buckets[model], self.breakers[model]
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _request(self, model: str, messages: list, kwargs: dict, deadline: float = None):
+        """Single HTTP call, timed out at the deadline; feeds rate-limit headers back into the bucket"""
+        timeout = _remaining(deadline)
+        if timeout <= 0:
+            raise TimeoutError(f"Deadline passed before calling {model}")
+        raw = self.client.chat.completions.with_raw_response.create(
+            model=model, messages=messages, timeout=timeout, **kwargs
+        )
+        self._state(model)[0].update_from_headers(raw.headers)
+        return raw.parse()
+
+    def _hedged(self, model: str, messages: list, kwargs: dict, deadline: float = None):
+        """Send a duplicate request if the first is slow and budget allows; first success wins.
+        Never waits past the deadline (or LLM_TIMEOUT without one)."""
+        deadline = deadline or time.monotonic() + TIMEOUT
+        first = self._pool.submit(self._request, model, messages, kwargs, deadline)
+        if self.hedge_after <= 0 or _remaining(deadline) <= self.hedge_after:
+            return first.result(timeout=_remaining(deadline))
+
+        done, _ = wait([first], timeout=self.hedge_after)
+        if done or not self._state(model)[0].try_acquire():
+            return first.result(timeout=_remaining(deadline))
+
+        self._count("hedged")
+        pending = {first, self._pool.submit(self._request, model, messages, kwargs, deadline)}
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=_remaining(deadline), return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"Deadline passed waiting for {model}")
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _call_model(self, model: str, messages: list, kwargs: dict, weight: int, deadline: float):
+        bucket, breaker = self._state(model)
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {model}")
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not bucket.acquire(timeout=timeout, weight=weight):
+                raise TimeoutError(f"Deadline passed waiting for {model} rate budget")
+            try:
+                response = self._hedged(model, messages, kwargs, deadline)
+                breaker.record_success()
+                return response
+            except self._retryable as e:
+                error = e
+                retry_after = _retry_after(e)
+                if retry_after:
+                    bucket.pause(retry_after)
+                if attempt == self.max_retries:
+                    break
+                delay = backoff_delay(attempt, retry_after)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    break  # A retry would only finish after the caller gave up
+                self._count("retries")
+                time.sleep(delay)
+        breaker.record_failure()  # Once per request, not per attempt
+        raise error
+
+    def chat(self, messages: list, model: str = None, weight: int = None, deadline: float = None, **kwargs):
+        """
+        Create a chat completion with retries, falling back to the secondary model.
+        weight (share of the rate budget) and deadline (time.monotonic() based)
+        default to those of the scheduler job running on this thread, if any.
+        """
+        from pipeline.scheduler import current_job
+
+        job = current_job()
+        weight = job["weight"] if weight is None else weight
+        deadline = job["deadline"] if deadline is None else deadline
+
+        self._count("calls")
+        primary = model or self.model
+        try:
+            return self._call_model(primary, messages, kwargs, weight, deadline)
+        except Exception as e:
+            expired = deadline is not None and time.monotonic() >= deadline
+            if not self.fallback_model or primary == self.fallback_model or expired:
+                self._count("failures")
+                raise
+            print(f"⚠️ {primary} failed ({e}), falling back to {self.fallback_model}")
+            self._count("fallbacks")
+            try:
+                return self._call_model(self.fallback_model, messages, kwargs, weight, deadline)
+            except Exception:
+                self._count("failures")
+                raise
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            models = {
+                m: {"rate": round(self.buckets[m].rate, 3), "circuit": self.breakers[m].state}
+                for m in self.buckets
+            }
+        return {**stats, "models": models}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm() -> LLMClient:
+    """Shared client, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
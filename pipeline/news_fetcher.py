@@ -7,11 +7,6 @@ load_dotenv()
 
 GNEWS_API_KEY = os.getenv("GNEWS_API_KEY")
 
-if not GNEWS_API_KEY or GNEWS_API_KEY == "your_gnews_key_here":
-    print("⚠️ GNEWS_API_KEY not set! News fetching will not work.")
-else:
-    print("✅ GNews API Key loaded!")
-
 def fetch_latest_news(query: str = "health", max_results: int = 10) -> list:
     """Fetch latest news articles from GNews API"""
     try:
@@ -90,8 +85,17 @@ def fetch_news_by_topic(topic: str = "science", max_results: int = 10) -> list:
         print(f"❌ News fetch error: {e}")
         return []
 
-def save_articles_to_folder(articles: list, folder: str = "data/articles"):
-    """Save articles as text files for Pathway to ingest"""
+def write_article(filename: str, content: str):
+    """Write one article file atomically"""
+    # Write under a non-.txt name first so the indexers never see a half-written file
+    with open(f"{filename}.part", "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(f"{filename}.part", filename)
+
+def save_articles_to_folder(articles: list, folder: str = "data/articles", queue: str = "ingest"):
+    """Save articles as text files for Pathway to ingest (on the scheduler's ingest queue)"""
+    from pipeline.scheduler import get_scheduler
+
     os.makedirs(folder, exist_ok=True)
     
     saved_count = 0
@@ -106,9 +110,8 @@ URL: {article['url']}
 
 {article['content']}
 """
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(content)
+        get_scheduler().run(queue, write_article, filename, content)
         saved_count += 1
     
     print(f"💾 Saved {saved_count} articles to {folder}")
-    return saved_count
\ No newline at end of file
+    return saved_count
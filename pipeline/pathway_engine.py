@@ -2,10 +2,6 @@
 Pathway Real-Time Document Processing Engine
 This demonstrates Pathway's streaming capabilities for the hackathon
 """
-import pathway as pw
-from pathway.xpacks.llm.embedders import SentenceTransformerEmbedder
-from pathway.xpacks.llm.vector_store import VectorStoreServer
-from pathway.xpacks.llm.splitters import TokenCountSplitter
 import os
 import threading
 import time
@@ -34,6 +30,7 @@ class PathwayEngine:
     def _run_pipeline(self):
         """Internal: Run the Pathway pipeline"""
         try:
+            import pathway as pw  # Deferred: importing Pathway takes seconds
             os.makedirs(DATA_FOLDER, exist_ok=True)
             
             print(f"📁 Watching folder: {DATA_FOLDER}")
@@ -79,8 +76,6 @@ class PathwayEngine:
             "files": len(os.listdir(DATA_FOLDER)) if os.path.exists(DATA_FOLDER) else 0
         }
 
-# Global instance
-pathway_engine = PathwayEngine()
 
 
 class PathwayVectorStore:
@@ -178,5 +173,33 @@ class PathwayVectorStore:
             "folder": DATA_FOLDER
         }
 
-# Global instance
-pathway_vector_store = PathwayVectorStore()
\ No newline at end of file
+# Global instances, created on first use
+_pathway_engine = None
+_pathway_vector_store = None
+_instances_lock = threading.Lock()
+
+def get_pathway_engine() -> PathwayEngine:
+    """Shared engine, created on first use"""
+    global _pathway_engine
+    if _pathway_engine is None:
+        with _instances_lock:
+            if _pathway_engine is None:
+                _pathway_engine = PathwayEngine()
+    return _pathway_engine
+
+def get_pathway_vector_store() -> PathwayVectorStore:
+    """Shared store, created on first use"""
+    global _pathway_vector_store
+    if _pathway_vector_store is None:
+        with _instances_lock:
+            if _pathway_vector_store is None:
+                _pathway_vector_store = PathwayVectorStore()
+    return _pathway_vector_store
+
+def __getattr__(name):
+    # Keeps `from pipeline.pathway_engine import pathway_engine` working without building it at import
+    if name == "pathway_engine":
+        return get_pathway_engine()
+    if name == "pathway_vector_store":
+        return get_pathway_vector_store()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,152 @@
+"""
+Token-Budgeted Prompt Builder
+Counts tokens locally, caches the static system prompt, and compresses
+retrieved context down to the sentences most relevant to the claim
+"""
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+MAX_CONTEXT_TOKENS = int(os.getenv("MAX_CONTEXT_TOKENS", "1500"))
+
+_WORD_RE = re.compile(r"\w+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_HEADER_RE = re.compile(r"^(TITLE|SOURCE|DATE|URL):.{0,200}$")  # Short single-field lines only
+
+# Recent per-call usage, newest last
+_usage = deque(maxlen=500)
+_usage_lock = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (~0.75 words per token), good enough for budgeting"""
+    if not text:
+        return 0
+    return max(1, math.ceil(len(_WORD_RE.findall(text)) * 4 / 3))
+
+
+@lru_cache(maxsize=32)
+def _cached_system(prompt: str) -> tuple:
+    return prompt.strip(), count_tokens(prompt)
+
+
+def system_message(prompt: str) -> tuple:
+    """Return (message, tokens) for a static system prompt; counted only once"""
+    content, tokens = _cached_system(prompt)
+    return {"role": "system", "content": content}, tokens
+
+
+def _normalize(sentence: str) -> str:
+    return " ".join(_WORD_RE.findall(sentence.lower()))
+
+
+def split_sentences(context: str) -> list:
+    """
+    Split context into (sentence, is_header, chunk) items in original order.
+    Short SOURCE:/DATE:/TITLE:/URL: lines are kept per chunk as provenance;
+    only body sentences are deduplicated across chunks.
+    """
+    seen = set()
+    items = []
+    chunk, in_body = 0, False
+    for line in (context or "").splitlines():
+        line = line.strip()
+        if _HEADER_RE.match(line):
+            if in_body:
+                chunk, in_body = chunk + 1, False  # A header after body text starts a new chunk
+            items.append((line, True, chunk))
+            continue
+        for sentence in _SENTENCE_RE.split(line):
+            sentence = sentence.strip()
+            key = _normalize(sentence)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            in_body = True
+            items.append((sentence, False, chunk))
+    return items
+
+
+def compress_context(context: str, claim: str, token_budget: int = MAX_CONTEXT_TOKENS) -> str:
+    """
+    Deduplicate sentences across chunks and, if still over budget,
+    keep the sentences with the most claim-word overlap (in original order).
+    Header lines are kept for every chunk that still has a sentence in the result.
+    """
+    items = split_sentences(context)
+    costs = [count_tokens(text) for text, _, _ in items]
+    if sum(costs) <= token_budget:
+        return "\n".join(text for text, _, _ in items)
+
+    claim_words = set(_WORD_RE.findall(claim.lower()))
+    body = [i for i, (_, is_header, _) in enumerate(items) if not is_header]
+    ranked = sorted(
+        body,
+        key=lambda i: len(claim_words & set(_WORD_RE.findall(items[i][0].lower()))) / (costs[i] ** 0.5),
+        reverse=True,
+    )
+
+    header_costs = {}
+    for i, (_, is_header, chunk) in enumerate(items):
+        if is_header:
+            header_costs[chunk] = header_costs.get(chunk, 0) + costs[i]
+
+    keep, chunks, used = set(), set(), 0
+    for i in ranked:
+        chunk = items[i][2]
+        cost = costs[i] + (header_costs.get(chunk, 0) if chunk not in chunks else 0)
+        if used + cost > token_budget:
+            continue
+        keep.add(i)
+        chunks.add(chunk)
+        used += cost
+    return "\n".join(
+        text for i, (text, is_header, chunk) in enumerate(items)
+        if i in keep or (is_header and chunk in chunks)
+    )
+
+
+def build_messages(system_prompt: str, claim: str, context: str = "", token_budget: int = MAX_CONTEXT_TOKENS) -> tuple:
+    """Build chat messages for a claim; returns (messages, estimated tokens in)"""
+    system, system_tokens = system_message(system_prompt)
+    context = compress_context(context, claim, token_budget) if context else ""
+    user = f"CLAIM: {claim}\n\nCONTEXT:\n{context}" if context else f"CLAIM: {claim}"
+    return [system, {"role": "user", "content": user}], system_tokens + count_tokens(user)
+
+
+def record_usage(name: str, tokens_in: int, response=None, started: float = None) -> dict:
+    """Record tokens-in/out for one LLM call, preferring the API's own usage counts"""
+    usage = getattr(response, "usage", None)
+    entry = {
+        "call": name,
+        "tokens_in": getattr(usage, "prompt_tokens", None) or tokens_in,
+        "tokens_out": getattr(usage, "completion_tokens", None) or 0,
+        "estimated_in": tokens_in,
+        "latency_ms": round((time.time() - started) * 1000, 1) if started else None,
+        "at": time.time(),
+    }
+    with _usage_lock:
+        _usage.append(entry)
+    return entry
+
+
+def get_token_stats() -> dict:
+    """Summarize recorded LLM usage"""
+    with _usage_lock:
+        calls = list(_usage)
+    if not calls:
+        return {"calls": 0, "tokens_in": 0, "tokens_out": 0}
+    tokens_in = sum(c["tokens_in"] for c in calls)
+    tokens_out = sum(c["tokens_out"] for c in calls)
+    return {
+        "calls": len(calls),
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "avg_tokens_in": round(tokens_in / len(calls), 1),
+        "avg_tokens_out": round(tokens_out / len(calls), 1),
+        "last": calls[-1],
+    }
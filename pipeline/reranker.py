@@ -0,0 +1,156 @@
+"""
+Context Re-Ranker
+Scores retrieved chunks by similarity, source credibility and freshness,
+then packs the best ones into a token budget (Pure Python, no Numpy)
+"""
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from pipeline.fact_checker import get_source_credibility
+from pipeline.prompt_builder import count_tokens
+
+# Default weights for the combined relevance score (should sum to 1.0)
+SIMILARITY_WEIGHT = 0.6
+CREDIBILITY_WEIGHT = 0.25
+RECENCY_WEIGHT = 0.15
+
+RECENCY_HALF_LIFE_DAYS = 14.0
+UNKNOWN_RECENCY = 0.5  # Neutral score when a chunk has no usable date
+
+# MMR trade-off: 1.0 = pure relevance, 0.0 = pure diversity
+MMR_LAMBDA = 0.7
+DUPLICATE_OVERLAP = 0.9  # Chunks this similar to an already-picked one are dropped
+
+_WORD_RE = re.compile(r"\w+")
+_HEADER_RE = re.compile(r"^(SOURCE|DATE):\s*(.*)$", re.MULTILINE)
+
+
+def _parse_headers(text: str) -> dict:
+    """Read the SOURCE:/DATE: headers written by ingest and save_articles_to_folder"""
+    headers = {}
+    for key, value in _HEADER_RE.findall(text[:500]):
+        headers.setdefault(key.lower(), value.strip())
+    return headers
+
+
+@lru_cache(maxsize=4096)
+def _document_headers(path: str) -> dict:
+    """Headers of the file a chunk came from; only a document's first chunk carries them"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return _parse_headers(f.read(500))
+    except (OSError, UnicodeDecodeError):
+        return {}
+
+
+def _parse_date(value):
+    """Parse ISO dates (GNews publishedAt) or unix timestamps"""
+    if value in (None, ""):
+        return None
+    try:
+        if isinstance(value, (int, float)) or str(value).isdigit():
+            return datetime.fromtimestamp(float(value), tz=timezone.utc)
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+    except (ValueError, OSError, OverflowError):
+        return None
+
+
+def _similarity(chunk: dict) -> float:
+    """Pathway /v1/retrieve returns a distance, SimpleVectorStore a score"""
+    if "score" in chunk:
+        return float(chunk["score"])
+    if "dist" in chunk:
+        return 1.0 - float(chunk["dist"])
+    return 0.0
+
+
+def recency_score(published, now=None, half_life_days: float = RECENCY_HALF_LIFE_DAYS) -> float:
+    """Exponential time-decay: 1.0 for brand new, 0.5 after one half-life"""
+    published = _parse_date(published)
+    if published is None:
+        return UNKNOWN_RECENCY
+    now = now or datetime.now(timezone.utc)
+    age_days = max(0.0, (now - published).total_seconds() / 86400)
+    return 0.5 ** (age_days / half_life_days)
+
+
+def _overlap(a: set, b: set) -> float:
+    """Jaccard similarity of word sets, used as a cheap redundancy measure"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def score_chunks(chunks: list, now=None) -> list:
+    """Attach similarity, credibility, recency and combined relevance to each chunk"""
+    scored = []
+    for chunk in chunks:
+        text = chunk.get("text", "")
+        metadata = chunk.get("metadata") or {}
+        headers = _parse_headers(text)
+        if metadata.get("path") and not ("source" in headers and "date" in headers):
+            headers = {**_document_headers(metadata["path"]), **headers}
+
+        source = metadata.get("source") or headers.get("source", "")
+        published = (
+            metadata.get("published")
+            or headers.get("date")
+            or metadata.get("modified_at")
+        )
+
+        similarity = max(0.0, min(1.0, _similarity(chunk)))
+        credibility = get_source_credibility(source)["score"] / 100
+        recency = recency_score(published, now=now)
+
+        scored.append({
+            **chunk,
+            "source": source or "Unknown",
+            "similarity": similarity,
+            "credibility": credibility,
+            "recency": recency,
+            "relevance": (
+                SIMILARITY_WEIGHT * similarity
+                + CREDIBILITY_WEIGHT * credibility
+                + RECENCY_WEIGHT * recency
+            ),
+            "tokens": count_tokens(text),
+        })
+    return scored
+
+
+def rerank_chunks(chunks: list, token_budget: int = 1200, mmr_lambda: float = MMR_LAMBDA, now=None) -> list:
+    """
+    Re-rank retrieved chunks and pack them into a token budget.
+    Greedy knapsack: repeatedly take the chunk with the best MMR score
+    (relevance minus redundancy with what is already picked) that still fits.
+    """
+    candidates = score_chunks(chunks, now=now)
+    for c in candidates:
+        c["_words"] = set(_WORD_RE.findall(c.get("text", "").lower()))
+
+    selected = []
+    remaining = token_budget
+    while candidates:
+        best, best_mmr = None, None
+        for c in candidates:
+            if c["tokens"] > remaining:
+                continue
+            redundancy = max((_overlap(c["_words"], s["_words"]) for s in selected), default=0.0)
+            if redundancy >= DUPLICATE_OVERLAP:
+                continue
+            mmr = mmr_lambda * c["relevance"] - (1 - mmr_lambda) * redundancy
+            if best_mmr is None or mmr > best_mmr:
+                best, best_mmr = c, mmr
+        if best is None:
+            break
+        candidates.remove(best)
+        selected.append(best)
+        remaining -= best["tokens"]
+
+    for s in selected:
+        del s["_words"]
+    return selected
@@ -0,0 +1,147 @@
+"""
+Prioritized Work Scheduler
+Separate queues for interactive, ingest and batch work sharing one pool of
+workers with weighted fair (stride) scheduling, interactive deadlines that
+follow the job into the LLM client, and queue-depth / wait-time metrics
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+# Weights set both the dequeue share and the share of LLM rate tokens
+QUEUE_WEIGHTS = {"interactive": 8, "ingest": 3, "batch": 1}
+WORKERS = int(os.getenv("SCHEDULER_WORKERS", "4"))
+RESERVED_INTERACTIVE = int(os.getenv("SCHEDULER_RESERVED_INTERACTIVE", "1"))  # workers that only serve interactive
+INTERACTIVE_DEADLINE = float(os.getenv("INTERACTIVE_DEADLINE", "20"))  # seconds
+
+
+class DeadlineExceeded(Exception):
+    """Raised for jobs that waited past their deadline and were dropped"""
+
+
+_current = threading.local()
+
+
+def current_job() -> dict:
+    """Queue, weight and deadline (time.monotonic) of the job running on this thread"""
+    return getattr(_current, "job", None) or {"queue": None, "weight": 1, "deadline": None}
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(len(values) * pct / 100) - 1))]
+
+
+class Scheduler:
+    def __init__(self, workers: int = WORKERS, weights: dict = None, reserved_interactive: int = RESERVED_INTERACTIVE):
+        self.weights = dict(weights or QUEUE_WEIGHTS)
+        self.queues = {name: deque() for name in self.weights}
+        self.passes = {name: 0.0 for name in self.weights}  # stride-scheduling virtual time
+        self.waits = {name: deque(maxlen=500) for name in self.weights}
+        self.counts = {name: {"submitted": 0, "completed": 0, "dropped": 0, "failed": 0} for name in self.weights}
+        self.cond = threading.Condition()
+
+        for i in range(workers):
+            only = ("interactive",) if i < reserved_interactive else None
+            threading.Thread(target=self._worker, args=(only,), daemon=True, name=f"scheduler-{i}").start()
+
+    def submit(self, queue: str, fn, *args, deadline: float = None, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs); deadline is seconds from now after which it is dropped"""
+        if queue not in self.queues:
+            raise ValueError(f"Unknown queue: {queue}")
+        future = Future()
+        now = time.monotonic()
+        job = (fn, args, kwargs, future, now, now + deadline if deadline else None)
+        with self.cond:
+            if not self.queues[queue]:
+                # A queue waking up from idle must not bank credit from the time it was empty
+                active = [self.passes[q] for q, items in self.queues.items() if items]
+                self.passes[queue] = max(self.passes[queue], min(active, default=self.passes[queue]))
+            self.queues[queue].append(job)
+            self.counts[queue]["submitted"] += 1
+            self.cond.notify_all()  # Reserved workers may not be able to take this job
+        return future
+
+    def run(self, queue: str, fn, *args, deadline: float = None, **kwargs):
+        """Submit and wait for the result; runs inline if already on a scheduler worker"""
+        if current_job()["queue"]:
+            return fn(*args, **kwargs)
+        if deadline is None and queue == "interactive":
+            deadline = INTERACTIVE_DEADLINE
+        return self.submit(queue, fn, *args, deadline=deadline, **kwargs).result()
+
+    def _next_job(self, only):
+        """Pick the non-empty queue with the lowest pass value (weighted fair share)"""
+        ready = [q for q, items in self.queues.items() if items and (only is None or q in only)]
+        if not ready:
+            return None, None
+        queue = min(ready, key=lambda q: (self.passes[q], -self.weights[q]))
+        self.passes[queue] += 1.0 / self.weights[queue]
+        return queue, self.queues[queue].popleft()
+
+    def _worker(self, only):
+        while True:
+            with self.cond:
+                queue, job = self._next_job(only)
+                while job is None:
+                    self.cond.wait()
+                    queue, job = self._next_job(only)
+
+            fn, args, kwargs, future, queued_at, deadline = job
+            now = time.monotonic()
+            with self.cond:
+                self.waits[queue].append(now - queued_at)
+
+            if deadline is not None and now > deadline:
+                with self.cond:
+                    self.counts[queue]["dropped"] += 1
+                future.set_exception(DeadlineExceeded(f"{queue} job waited {now - queued_at:.1f}s"))
+                continue
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            _current.job = {"queue": queue, "weight": self.weights[queue], "deadline": deadline}
+            try:
+                future.set_result(fn(*args, **kwargs))
+                outcome = "completed"
+            except Exception as e:
+                future.set_exception(e)
+                outcome = "failed"
+            finally:
+                _current.job = None
+            with self.cond:
+                self.counts[queue][outcome] += 1
+
+    def get_stats(self) -> dict:
+        with self.cond:
+            return {
+                name: {
+                    "depth": len(self.queues[name]),
+                    "weight": self.weights[name],
+                    **self.counts[name],
+                    "wait_p50_ms": round(percentile(list(self.waits[name]), 50) * 1000, 1),
+                    "wait_p99_ms": round(percentile(list(self.waits[name]), 99) * 1000, 1),
+                    "wait_max_ms": round(max(self.waits[name], default=0.0) * 1000, 1),
+                }
+                for name in self.weights
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Shared scheduler, workers started on first use"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler()
+    return _scheduler
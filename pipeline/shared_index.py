@@ -0,0 +1,296 @@
+"""
+Shared Read-Only Vector Index
+Embeddings are stored as immutable .npy segments that every web worker
+memory-maps (zero-copy, pages shared through the OS cache). A single writer
+process owns ingest: it watches the articles folder, appends new segments,
+compacts small ones, and bumps a generation counter so readers only map
+what is new.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+INDEX_FOLDER = os.getenv("INDEX_FOLDER", "./data/index")
+DATA_FOLDER = "./data/articles"
+POLL_INTERVAL = float(os.getenv("INDEX_POLL_INTERVAL", "2"))
+EMBED_MODEL = "all-MiniLM-L6-v2"  # Same model Pathway mode uses
+# all-MiniLM-L6-v2 truncates input at 256 word pieces (~190 English words);
+# longer chunks would only have their beginning embedded
+CHUNK_WORDS = 180
+MAX_SEGMENTS = int(os.getenv("INDEX_MAX_SEGMENTS", "8"))  # Compact once there are more than this
+COMPACT_MAX_ROWS = int(os.getenv("INDEX_COMPACT_MAX_ROWS", "20000"))  # Segments this big are left alone
+SETTLE_SECONDS = 1.0  # Skip files modified this recently; they may still be being written
+RETIRE_AFTER = 60.0  # Keep compacted-away files this long for readers still on the old manifest
+MANIFEST = "manifest.json"
+
+_HEADER_RE = re.compile(r"^(SOURCE|DATE):\s*(.*)$", re.MULTILINE)
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def get_encoder():
+    """Local sentence-transformer, loaded once per process; raises if it can't be loaded"""
+    global _encoder
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                from sentence_transformers import SentenceTransformer
+                _encoder = SentenceTransformer(EMBED_MODEL)
+    return _encoder
+
+
+def embed(texts: list) -> np.ndarray:
+    """Unit-normalized float32 embeddings, one row per text"""
+    return get_encoder().encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def _atomic_write(path: str, write):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def read_manifest(folder: str = INDEX_FOLDER) -> dict:
+    try:
+        with open(os.path.join(folder, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"generation": 0, "segments": []}
+
+
+def chunk_document(text: str, path: str) -> list:
+    """
+    Split a document into ~CHUNK_WORDS word chunks carrying its SOURCE/DATE headers.
+    Line breaks are kept, so header lines stay short lines of their own for the prompt builder.
+    """
+    headers = {k.lower(): v.strip() for k, v in _HEADER_RE.findall(text[:500])}
+    metadata = {"path": path, "source": headers.get("source", ""), "published": headers.get("date", "")}
+    try:
+        metadata["modified_at"] = int(os.path.getmtime(path))
+    except OSError:
+        pass
+
+    chunks, lines, count = [], [], 0
+    for line in text.splitlines():
+        words = line.split()
+        while words:
+            take = words[:CHUNK_WORDS - count]
+            words = words[len(take):]
+            lines.append(" ".join(take))
+            count += len(take)
+            if count >= CHUNK_WORDS:
+                chunks.append("\n".join(lines))
+                lines, count = [], 0
+    if lines:
+        chunks.append("\n".join(lines))
+    return [{"text": chunk, "metadata": metadata} for chunk in chunks]
+
+
+class IndexWriter:
+    """Single writer: turns new files in the articles folder into index segments"""
+
+    def __init__(self, folder: str = INDEX_FOLDER, data_folder: str = DATA_FOLDER):
+        self.folder = folder
+        self.data_folder = data_folder
+        os.makedirs(folder, exist_ok=True)
+        self.manifest = read_manifest(folder)
+        self.indexed = set()
+        self.retired = []  # (time retired, file names) waiting to be deleted
+        for segment in self.manifest["segments"]:
+            with open(os.path.join(folder, segment["meta"]), "r", encoding="utf-8") as f:
+                self.indexed.update(c["metadata"]["path"] for c in json.load(f))
+
+    def pending_files(self) -> list:
+        if not os.path.exists(self.data_folder):
+            return []
+        settled = time.time() - SETTLE_SECONDS
+        pending = []
+        for name in sorted(os.listdir(self.data_folder)):
+            path = os.path.join(self.data_folder, name)
+            if not name.endswith(".txt") or path in self.indexed:
+                continue
+            try:
+                if os.path.getmtime(path) > settled:
+                    continue
+            except OSError:
+                continue
+            pending.append(path)
+        return pending
+
+    def _publish(self, segments: list):
+        """Write a manifest listing `segments` as the next generation"""
+        self.manifest = {"generation": self.manifest["generation"] + 1, "segments": segments}
+        _atomic_write(os.path.join(self.folder, MANIFEST), lambda f: f.write(json.dumps(self.manifest).encode("utf-8")))
+
+    def _write_segment(self, vectors: np.ndarray, chunks: list, segments: list, retired: list = ()):
+        """Write a segment, then publish a manifest listing `segments` plus the new one"""
+        generation = self.manifest["generation"] + 1
+        name = f"segment_{generation:06d}"
+        _atomic_write(os.path.join(self.folder, f"{name}.npy"), lambda f: np.save(f, vectors))
+        _atomic_write(os.path.join(self.folder, f"{name}.json"), lambda f: f.write(json.dumps(chunks).encode("utf-8")))
+
+        # Manifest goes last: readers never see a generation whose files are incomplete
+        self._publish(segments + [{"vectors": f"{name}.npy", "meta": f"{name}.json", "rows": len(chunks)}])
+        if retired:
+            self.retired.append((time.monotonic(), [f for s in retired for f in (s["vectors"], s["meta"])]))
+
+    def add_files(self, paths: list) -> int:
+        """Embed the given files into one new segment; returns rows written.
+        On embedding failure nothing is written and the files are retried next poll."""
+        chunks, readable = [], []
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    chunks.extend(chunk_document(f.read(), path))
+                readable.append(path)
+            except OSError:
+                continue
+        if not chunks:
+            self.indexed.update(readable)  # Empty documents: nothing to index, don't re-read them forever
+            return 0
+
+        try:
+            vectors = embed([c["text"] for c in chunks])
+        except Exception as e:
+            print(f"❌ Embedding failed, will retry {len(paths)} files: {e}")
+            return 0
+
+        # A zero row can never be retrieved; leave its file out so it is retried
+        bad = {chunks[i]["metadata"]["path"] for i in np.flatnonzero(np.linalg.norm(vectors, axis=1) == 0)}
+        keep = [i for i, c in enumerate(chunks) if c["metadata"]["path"] not in bad]
+        if keep:
+            self._write_segment(vectors[keep], [chunks[i] for i in keep], self.manifest["segments"])
+        self.indexed.update(p for p in readable if p not in bad)
+        return len(keep)
+
+    def compact(self) -> bool:
+        """Merge all small segments into one new generation once there are too many"""
+        segments = self.manifest["segments"]
+        small = [s for s in segments if s["rows"] < COMPACT_MAX_ROWS]
+        if len(segments) <= MAX_SEGMENTS or len(small) < 2:
+            return False
+
+        vectors, chunks = [], []
+        for s in small:
+            vectors.append(np.load(os.path.join(self.folder, s["vectors"])))
+            with open(os.path.join(self.folder, s["meta"]), "r", encoding="utf-8") as f:
+                chunks.extend(json.load(f))
+        large = [s for s in segments if s["rows"] >= COMPACT_MAX_ROWS]
+        self._write_segment(np.concatenate(vectors), chunks, large, retired=small)
+        print(f"🗜️ Compacted {len(small)} segments into one ({len(chunks)} rows), generation {self.manifest['generation']}")
+        return True
+
+    def _delete_retired(self):
+        now = time.monotonic()
+        while self.retired and now - self.retired[0][0] >= RETIRE_AFTER:
+            for name in self.retired.pop(0)[1]:
+                try:
+                    os.remove(os.path.join(self.folder, name))
+                except OSError:
+                    pass
+
+    def run_forever(self, poll_interval: float = POLL_INTERVAL):
+        get_encoder()  # Fail at startup, not on the first document
+        if not self.manifest["generation"]:
+            self._publish([])  # An empty corpus is a valid index; lets workers report ready
+        print(f"📁 Index writer watching {self.data_folder} (generation {self.manifest['generation']})")
+        while True:
+            pending = self.pending_files()
+            if pending:
+                rows = self.add_files(pending)
+                print(f"✅ Indexed {len(pending)} files ({rows} chunks), generation {self.manifest['generation']}")
+                self.compact()
+            self._delete_retired()
+            time.sleep(poll_interval)
+
+
+def run_writer():
+    """Entry point for the dedicated writer process"""
+    IndexWriter().run_forever()
+
+
+class IndexReader:
+    """Per-worker view of the index; maps new segments when the generation changes"""
+
+    def __init__(self, folder: str = INDEX_FOLDER):
+        self.folder = folder
+        self.generation = 0
+        self.segments = ()  # (vectors memmap, metadata list) pairs, never mutated in place
+        self._mapped = {}  # segment file name -> (vectors, metadata), so unchanged segments aren't re-mapped
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        """Map segments new in the current manifest and drop compacted-away ones; cheap when nothing changed"""
+        try:
+            mtime = os.stat(os.path.join(self.folder, MANIFEST)).st_mtime_ns
+        except OSError:
+            return self.generation
+        if mtime == self._mtime:
+            return self.generation
+
+        with self._lock:
+            manifest = read_manifest(self.folder)
+            mapped = {}
+            try:
+                for segment in manifest["segments"]:
+                    name = segment["vectors"]
+                    if name in self._mapped:
+                        mapped[name] = self._mapped[name]
+                        continue
+                    vectors = np.load(os.path.join(self.folder, name), mmap_mode="r")
+                    with open(os.path.join(self.folder, segment["meta"]), "r", encoding="utf-8") as f:
+                        mapped[name] = (vectors, json.load(f))
+            except OSError:
+                return self.generation  # Manifest moved on mid-read; keep the old view, retry next call
+            self._mapped = mapped
+            self.segments = tuple(mapped.values())
+            self.generation = manifest["generation"]
+            self._mtime = mtime
+        return self.generation
+
+    def search(self, query: str, top_k: int = 5) -> list:
+        self.refresh()
+        segments = self.segments
+        if not segments:
+            return []
+
+        q = embed([query])[0]
+        candidates = []
+        for vectors, meta in segments:
+            scores = vectors @ q
+            k = min(top_k, len(scores))
+            for i in np.argpartition(-scores, k - 1)[:k]:
+                candidates.append((float(scores[i]), meta[i]))
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        return [{**chunk, "score": score} for score, chunk in candidates[:top_k]]
+
+    def get_stats(self) -> dict:
+        return {
+            "generation": self.generation,
+            "segments": len(self.segments),
+            "rows": sum(len(meta) for _, meta in self.segments),
+            "folder": self.folder,
+            "model_loaded": _encoder is not None,
+        }
+
+
+_reader = None
+_reader_lock = threading.Lock()
+
+
+def get_index_reader() -> IndexReader:
+    """Shared reader for this process, created on first use"""
+    global _reader
+    if _reader is None:
+        with _reader_lock:
+            if _reader is None:
+                _reader = IndexReader()
+    return _reader
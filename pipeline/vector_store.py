@@ -1,4 +1,4 @@
-import numpy as np
+import threading
 from pipeline.embedder import get_embedding
 
 class SimpleVectorStore:
@@ -51,4 +51,20 @@ class SimpleVectorStore:
     def get_stats(self):
         return {"total_documents": len(self.documents), "folder": "data/articles"}
 
-vector_store = SimpleVectorStore()
\ No newline at end of file
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+def get_vector_store() -> SimpleVectorStore:
+    """Shared store, created on first use"""
+    global _vector_store
+    if _vector_store is None:
+        with _vector_store_lock:
+            if _vector_store is None:
+                _vector_store = SimpleVectorStore()
+    return _vector_store
+
+def __getattr__(name):
+    # Keeps `from pipeline.vector_store import vector_store` working without building it at import
+    if name == "vector_store":
+        return get_vector_store()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file